@@ -17,10 +17,17 @@
  Date: October 2015
 """
 
+import codecs
+import functools
+import hashlib
 import os
+import struct
 import sys
+import threading
 import time
 from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import chain
 from typing import Generator
 
 import numpy as np
@@ -28,21 +35,24 @@ import pandas as pd
 import rasterio
 #from gdalconst import *
 from osgeo import gdal, ogr, osr
-from rasterio import transform
+from rasterio.windows import Window, from_bounds
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import breadth_first_order
 
 if rasterio.__version__[0] == "0":
     from rasterio.warp import RESAMPLING, calculate_default_transform, reproject
 if rasterio.__version__[0] == "1":
     from rasterio.warp import calculate_default_transform, reproject, Resampling
 
+    RESAMPLING = Resampling
+
 import fiona
 import geopandas as gpd
-from geopandas.tools import sjoin
 
 os.environ["PATH"] += r";C:\Program Files\ArcGIS\Pro\bin"
 sys.path.append(r"C:\Program Files\ArcGIS\Pro\Resources\ArcPy")
 import arcpy
-from arcpy.sa import TabulateArea, ZonalStatisticsAsTable
+from arcpy.sa import TabulateArea
 
 ##############################################################################
 
@@ -54,7 +64,7 @@ class LicenseError(Exception):
 ##############################################################################
 
 
-def UpcomDict(nhd, interVPUtbl, zone):
+def UpcomDict(nhd, interVPUtbl, zone, cache_dir=None):
     """
     __author__ = "Marc Weber <weber.marc@epa.gov>"
                  "Ryan Hill <hill.ryan@epa.gov>"
@@ -68,13 +78,23 @@ def UpcomDict(nhd, interVPUtbl, zone):
     ---------
     nhd             : the directory contining NHDPlus data
     interVPUtbl     : the table that holds the inter-VPU connections to manage connections and anomalies in the NHD
+    zone            : string of an NHDPlusV2 VPU zone, i.e. 10L, 16, 17
+    cache_dir       : directory to keep Parquet copies of the NHD tables in, none kept if None
     """
     # Returns UpCOMs dictionary for accumulation process
     # Provide either path to from-to tables or completed from-to table
-    flow = dbf2DF(f"{nhd}/NHDPlusAttributes/PlusFlow.dbf")[["TOCOMID", "FROMCOMID"]]
+    flow = _read_dbf_cached(
+        f"{nhd}/NHDPlusAttributes/PlusFlow.dbf",
+        ("TOCOMID", "FROMCOMID"),
+        cache_dir,
+    )
     flow = flow[(flow.TOCOMID != 0) & (flow.FROMCOMID != 0)]
     # check to see if out of zone values have FTYPE = 'Coastline'
-    fls = dbf2DF(f"{nhd}/NHDSnapshot/Hydrography/NHDFlowline.dbf")
+    fls = _read_dbf_cached(
+        f"{nhd}/NHDSnapshot/Hydrography/NHDFlowline.dbf",
+        ("COMID", "FTYPE"),
+        cache_dir,
+    )
     coastfl = fls.COMID[fls.FTYPE == "Coastline"]
     flow = flow[~flow.FROMCOMID.isin(coastfl.values)]
     # remove these FROMCOMIDs from the 'flow' table, there are three COMIDs here
@@ -84,17 +104,19 @@ def UpcomDict(nhd, interVPUtbl, zone):
     # find values that are coming from other zones and remove the ones that
     # aren't in the interVPU table
     out = np.setdiff1d(flow.FROMCOMID.values, fls.COMID.values)
-    out = out[np.nonzero(out)]
+    out = out[out != 0]
     flow = flow[~flow.FROMCOMID.isin(np.setdiff1d(out, interVPUtbl.thruCOMIDs.values))]
     # Now table is ready for processing and the UpCOMs dict can be created
     fcom, tcom = flow.FROMCOMID.values, flow.TOCOMID.values
-    UpCOMs = defaultdict(list)
-    for i in range(0, len(flow), 1):
-        from_comid = fcom[i]
-        if from_comid == 0:
-            continue
-        else:
-            UpCOMs[tcom[i]].append(from_comid)
+    # group the FROMCOMIDs by TOCOMID with one sort rather than a loop per row
+    order = np.argsort(tcom, kind="stable")
+    fcom, tcom = fcom[order], tcom[order]
+    tos, starts = np.unique(tcom, return_index=True)
+    ends = np.append(starts[1:], len(tcom))
+    UpCOMs = defaultdict(
+        list,
+        {to: fcom[s:e].tolist() for to, s, e in zip(tos.tolist(), starts, ends)},
+    )
     # add IDs from UpCOMadd column if working in ToZone, forces the flowtable connection though not there
     for interLine in interVPUtbl.values:
         if interLine[6] > 0 and interLine[2] == zone:
@@ -105,6 +127,136 @@ def UpcomDict(nhd, interVPUtbl, zone):
 ##############################################################################
 
 
+def build_csr(tree):
+    """
+    Converts the dictionary of upstream COMIDs into a compressed sparse row
+    graph on contiguous integer ids so the network can be crawled without
+    building python sets for every catchment. The id of a COMID is its
+    position in the returned, sorted array of COMIDs.
+
+    Arguments
+    ---------
+    tree            : Full dictionary of list of upstream COMIDs for each COMID in the zone
+    """
+    tos = np.fromiter(tree.keys(), dtype=np.int64, count=len(tree))
+    lengths = np.fromiter(map(len, tree.values()), dtype=np.int64, count=len(tree))
+    froms = np.fromiter(
+        chain.from_iterable(tree.values()), dtype=np.int64, count=lengths.sum()
+    )
+    ids = np.union1d(tos, froms)
+    rows = np.searchsorted(ids, np.repeat(tos, lengths))
+    cols = np.searchsorted(ids, froms)
+    graph = csr_matrix(
+        (np.ones(len(cols), dtype=np.int8), (rows, cols)), shape=(len(ids), len(ids))
+    )
+    return ids, graph
+
+
+##############################################################################
+
+
+def _crawl(token, tree):
+    """
+    Returns an array of the COMID and every COMID upstream of it, starting
+    with the COMID itself
+
+    Arguments
+    ---------
+    token           : a single COMID
+    tree            : tuple of COMIDs and CSR graph returned from `build_csr`
+    """
+    ids, graph = tree
+    root = np.searchsorted(ids, token)
+    if root == len(ids) or ids[root] != token:
+        return np.array([token])  # nothing flows into this COMID
+    return ids[breadth_first_order(graph, root, return_predecessors=False)]
+
+
+##############################################################################
+
+
+def all_upstream(tree, comids):
+    """
+    Finds every upstream COMID for each of the given COMIDs in one pass down
+    the network. COMIDs are visited in topological order from the headwaters
+    so that the upstream COMIDs of a catchment are built from those already
+    found for the catchments flowing into it, rather than re-crawling shared
+    sub-networks once for every COMID. Any COMIDs caught in a loop in the flow
+    table are crawled individually.
+
+    Arguments
+    ---------
+    tree            : Full dictionary of list of upstream COMIDs for each COMID in the zone,
+                      or the CSR graph of it returned from `build_csr`
+    comids          : numpy array of the COMIDs to return upstream COMIDs for
+
+    Returns
+    ---------
+    dict
+        numpy array of upstream COMIDs, w/ out the COMID itself, keyed by COMID
+    """
+    ids, graph = tree if isinstance(tree, tuple) else build_csr(tree)
+    comids = np.asarray(comids)
+    pos = np.minimum(np.searchsorted(ids, comids), max(len(ids) - 1, 0))
+    in_graph = ids[pos] == comids if len(ids) else np.zeros(len(comids), bool)
+    wanted = np.zeros(len(ids), dtype=bool)
+    wanted[pos[in_graph]] = True
+    down = graph.T.tocsr()  # rows hold the COMIDs that each COMID flows into
+    pending = np.diff(graph.indptr)  # upstream COMIDs not yet resolved
+    consumers = np.diff(down.indptr)  # downstream COMIDs yet to use this one
+    ups = {}
+    ready = deque(np.flatnonzero(pending == 0).tolist())
+    while ready:
+        v = ready.popleft()
+        froms = graph.indices[graph.indptr[v] : graph.indptr[v + 1]].tolist()
+        if len(froms) == 1:
+            ups[v] = np.append(froms[0], ups[froms[0]])
+        elif froms:  # braids can reach the same COMID along two paths
+            ups[v] = np.unique(np.concatenate([froms] + [ups[u] for u in froms]))
+        else:
+            ups[v] = np.array([], dtype=np.int64)
+        for u in froms:
+            consumers[u] -= 1
+            if consumers[u] == 0 and not wanted[u]:
+                del ups[u]  # no longer needed, keep memory down
+        for w in down.indices[down.indptr[v] : down.indptr[v + 1]].tolist():
+            pending[w] -= 1
+            if pending[w] == 0:
+                ready.append(w)
+    out = {}
+    for comid, p, found in zip(comids.tolist(), pos.tolist(), in_graph.tolist()):
+        if not found:
+            out[comid] = np.array([], dtype=ids.dtype)
+        elif p in ups:
+            out[comid] = ids[ups[p]]
+        else:  # never resolved, part of a loop in the network
+            out[comid] = _crawl(comid, (ids, graph))[1:]
+    return out
+
+
+##############################################################################
+
+
+def _visit(token, tree):
+    """
+    Returns the set of COMIDs upstream of `token`, including `token` itself.
+    This is the walk shared by `children` and `bastards`.
+    """
+    visited = set()
+    to_crawl = [token]
+    while to_crawl:
+        current = to_crawl.pop()
+        if current in visited:
+            continue
+        visited.add(current)
+        # .get() avoids inserting empty lists into a defaultdict tree
+        to_crawl.extend(c for c in tree.get(current, ()) if c not in visited)
+    return visited
+
+
+##############################################################################
+
+
 def children(token, tree, chkset=None):
     """
     __author__ = "Marc Weber <weber.marc@epa.gov>"
@@ -118,16 +270,7 @@ def children(token, tree, chkset=None):
     tree            : Full dictionary of list of upstream COMIDs for each COMID in the zone
     chkset          : set of all the NHD catchment COMIDs used to remove flowlines with no associated catchment
     """
-    visited = set()
-    to_crawl = deque([token])
-    while to_crawl:
-        current = to_crawl.popleft()
-        if current in visited:
-            continue
-        visited.add(current)
-        node_children = set(tree[current])
-        to_crawl.extendleft(node_children - visited)
-    # visited.remove(token)
+    visited = _visit(token, tree)
     if chkset != None:
         visited = visited.intersection(chkset)
     return list(visited)
@@ -149,15 +292,7 @@ def bastards(token, tree):
     tree            : Full dictionary of list of upstream COMIDs for each COMID in the zone
     chkset          : set of all the NHD catchment COMIDs, used to remove flowlines with no associated catchment
     """
-    visited = set()
-    to_crawl = deque([token])
-    while to_crawl:
-        current = to_crawl.popleft()
-        if current in visited:
-            continue
-        visited.add(current)
-        node_children = set(tree[current])
-        to_crawl.extendleft(node_children - visited)
+    visited = _visit(token, tree)
     visited.remove(token)
     return list(visited)
 
@@ -236,6 +371,43 @@ def GetRasterValueAtPoints(rasterfile, shapefile, fieldname):
 ##############################################################################
 
 
+def _map_blocks(inras, dst, windows, func):
+    """
+    Applies `func` to each block window of `inras` on a thread pool and writes
+    the result to the same window of the open dataset `dst`. Each thread reads
+    through its own handle on `inras`; only the write is locked, and `dst`
+    should be created with num_threads so GDAL compresses blocks in parallel.
+
+    Arguments
+    ---------
+    inras           : an input raster file (string)
+    dst             : an open rasterio dataset to write to
+    windows         : list of rasterio windows to process
+    func            : function taking a block array and returning the output block
+    """
+    local = threading.local()
+    handles = []
+    write_lock = threading.Lock()
+
+    def process(window):
+        if not hasattr(local, "src"):
+            local.src = rasterio.open(inras)
+            handles.append(local.src)
+        dst_data = func(local.src.read(1, window=window))
+        with write_lock:
+            dst.write_band(1, dst_data, window=window)
+
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(process, windows))
+    finally:
+        for handle in handles:
+            handle.close()
+
+
+##############################################################################
+
+
 def Reclass(inras, outras, reclass_dict, dtype=None):
     """
     __author__ =   "Marc Weber <weber.marc@epa.gov>"
@@ -270,28 +442,54 @@ def Reclass(inras, outras, reclass_dict, dtype=None):
             nodata=nd,
             dtype=dtype,
             bigtiff="YES",  # Output will be larger than 4GB
+            num_threads="ALL_CPUS",  # compress blocks on GDAL's own threads
         )
 
-        windows = src.block_windows(1)
+        # 8 and 16 bit integer rasters are converted through a lookup table
+        # covering every possible value, one gather per block
+        lut = None
+        in_nodata = src.meta["nodata"]
+        in_dtype = np.dtype(src.meta["dtype"])
+        if in_dtype.kind in "iu" and in_dtype.itemsize <= 2:
+            info = np.iinfo(in_dtype)
+            lut = np.arange(info.min, info.max + 1).astype(dtype)
+            for inval, outval in reclass_dict.items():
+                if info.min <= inval <= info.max:
+                    lut[int(inval) - info.min] = (
+                        nd if np.isnan(outval).any() else outval
+                    )
+            if in_nodata is not None and info.min <= in_nodata <= info.max:
+                lut[int(in_nodata) - info.min] = nd
+        else:
+            # wider types are matched against the sorted keys, one
+            # searchsorted per block rather than a comparison for each key
+            lookup = {
+                inval: nd if np.isnan(outval).any() else outval
+                for inval, outval in reclass_dict.items()
+            }
+            if in_nodata is not None:
+                lookup[in_nodata] = nd
+            keys = np.sort(np.array(list(lookup)))
+            vals = np.array([lookup[k] for k in keys.tolist()]).astype(dtype)
+
+        windows = [window for _, window in src.block_windows(1)]
+
+        def convert(src_data):
+            if lut is not None:
+                if info.min != 0:  # shift signed values to index the table
+                    src_data = src_data.astype(np.int32) - info.min
+                dst_data = lut[src_data]
+            else:
+                # cast once, then set every cell matching one of the keys
+                dst_data = src_data.astype(dtype)
+                if len(keys):
+                    idx = np.searchsorted(keys, src_data).clip(0, len(keys) - 1)
+                    hit = keys[idx] == src_data
+                    dst_data[hit] = vals[idx[hit]]
+            return dst_data
 
-        with rasterio.open(outras, "w", **kwargs) as dst:
-            for idx, window in windows:
-                src_data = src.read(1, window=window)
-                # Convert values
-                # src_data = np.where(src_data == in_nodata, nd, src_data).astype(dtype)
-                for inval, outval in reclass_dict.iteritems():
-                    if np.isnan(outval).any():
-                        # src_data = np.where(src_data != inval, src_data, kwargs['nodata']).astype(dtype)
-                        src_data = np.where(src_data == inval, nd, src_data).astype(
-                            dtype
-                        )
-                    else:
-                        src_data = np.where(src_data == inval, outval, src_data).astype(
-                            dtype
-                        )
-                # src_data = np.where(src_data == inval, outval, src_data)
-                dst_data = src_data
-                dst.write_band(1, dst_data, window=window)
+    with rasterio.open(outras, "w", **kwargs) as dst:
+        _map_blocks(inras, dst, windows, convert)
 
 
 ##############################################################################
@@ -318,7 +516,7 @@ def rasterMath(inras, outras, expression=None, out_dtype=None):
     """
     expression = expression.replace(inras, "src_data")
 
-    with rasterio.drivers():
+    with rasterio.Env():
         with rasterio.open(inras) as src:
             # Set dtype and nodata values
             if out_dtype is None:  # If no dtype defined, use input dtype
@@ -332,26 +530,26 @@ def rasterMath(inras, outras, expression=None, out_dtype=None):
                 # exec 'nd = np.iinfo(np.'+out_dtype+').max'
                 dt = out_dtype
             kwargs = src.meta.copy()
-            kwargs.update(driver="GTiff", count=1, compress="lzw", dtype=dt, nodata=nd)
+            kwargs.update(
+                driver="GTiff",
+                count=1,
+                compress="lzw",
+                dtype=dt,
+                nodata=nd,
+                num_threads="ALL_CPUS",
+            )
+            in_nodata = src.meta["nodata"]
+            windows = [window for _, window in src.block_windows(1)]
 
-            windows = src.block_windows(1)
+        def convert(src_data):
+            # Where src not eq to orig nodata, multiply by val, else set to new nodata. Set dtype
+            if expression == None:
+                # No expression produces copy of original raster (can use new data type)
+                return np.where(src_data != in_nodata, src_data, nd).astype(dt)
+            return np.where(src_data != in_nodata, eval(expression), nd).astype(dt)
 
-            with rasterio.open(outras, "w", **kwargs) as dst:
-                for idx, window in windows:
-                    src_data = src.read(1, window=window)
-                    # Where src not eq to orig nodata, multiply by val, else set to new nodata. Set dtype
-                    if expression == None:
-                        # No expression produces copy of original raster (can use new data type)
-                        dst_data = np.where(
-                            src_data != src.meta["nodata"], src_data, kwargs["nodata"]
-                        ).astype(dt)
-                    else:
-                        dst_data = np.where(
-                            src_data != src.meta["nodata"],
-                            eval(expression),
-                            kwargs["nodata"],
-                        ).astype(dt)
-                    dst.write_band(1, dst_data, window=window)
+        with rasterio.open(outras, "w", **kwargs) as dst:
+            _map_blocks(inras, dst, windows, convert)
 
 
 ##############################################################################
@@ -391,11 +589,13 @@ def Project(inras, outras, dst_crs, template_raster, nodata):
                 reproject(
                     source=rasterio.band(src, 1),
                     destination=rasterio.band(dst, 1),
-                    src_transform=src.affine,
+                    src_transform=src.transform,
                     src_crs=src.crs,
                     src_nodata=nodata,
                     dst_transform=affine,
                     dst_crs=dst_crs,
+                    num_threads=os.cpu_count(),
+                    warp_mem_limit=512,
                 )
 
 
@@ -465,31 +665,21 @@ def Resample(inras, outras, resamp_type, resamp_res):
                 "width": width,
                 "height": height,
                 "driver": "GTiff",
+                "compress": "lzw",
             }
         )
         with rasterio.open(outras, "w", **kwargs) as dst:
-            if resamp_type == "bilinear":
-                reproject(
-                    source=rasterio.band(src, 1),
-                    destination=rasterio.band(dst, 1),
-                    src_transform=src.affine,
-                    src_crs=src.crs,
-                    dst_transform=src.affine,
-                    dst_crs=dst_crs,
-                    resampling=RESAMPLING.bilinear,
-                    compress="lzw",
-                )
-            elif resamp_type == "nearest":
-                reproject(
-                    source=rasterio.band(src, 1),
-                    destination=rasterio.band(dst, 1),
-                    src_transform=affine,
-                    src_crs=src.crs,
-                    dst_transform=affine,
-                    dst_crs=src.crs,
-                    resampling=RESAMPLING.nearest,
-                    compress="lzw",
-                )
+            reproject(
+                source=rasterio.band(src, 1),
+                destination=rasterio.band(dst, 1),
+                src_transform=src.transform,
+                src_crs=src.crs,
+                dst_transform=affine,
+                dst_crs=src.crs,
+                resampling=RESAMPLING[resamp_type],
+                num_threads=os.cpu_count(),
+                warp_mem_limit=512,
+            )
 
 
 ##############################################################################
@@ -508,10 +698,16 @@ def ProjectResamp(inras, outras, out_proj, resamp_type, out_res):
     outproj         : projection to apply to output raster in EPSG format, i.e. EPSG:5070
     resamp          : resampling method to use - either nearest or bilinear
     """
-    with rasterio.drivers():
+    # let GDAL's warper tile and thread the whole raster in one call
+    with rasterio.Env(CPL_WORKER_THREADS=os.cpu_count()):
         with rasterio.open(inras) as src:
             affine, width, height = calculate_default_transform(
-                src.crs, out_proj, src.width, src.height, *src.bounds
+                src.crs,
+                out_proj,
+                src.width,
+                src.height,
+                *src.bounds,
+                resolution=out_res,
             )
             kwargs = src.meta.copy()
             kwargs.update(
@@ -525,40 +721,18 @@ def ProjectResamp(inras, outras, out_proj, resamp_type, out_res):
                 }
             )
 
-            windows = src.block_windows(1)
-
             with rasterio.open(outras, "w", **kwargs) as dst:
-                for idx, window in windows:
-                    if resamp_type == "bilinear":
-                        reproject(
-                            source=rasterio.band(src, 1),
-                            destination=rasterio.band(dst, 1),
-                            src_transform=src.affine,
-                            src_crs=src.crs,
-                            dst_transform=transform.from_origin(
-                                affine[2],
-                                affine[5],
-                                dist.transform[0],
-                                dst.transform[0],
-                            ),
-                            dst_crs=dst_crs,
-                            resampling=RESAMPLING.bilinear,
-                        )
-                    elif resamp_type == "nearest":
-                        reproject(
-                            source=rasterio.band(src, 1),
-                            destination=rasterio.band(dst, 1),
-                            src_transform=src.transform,
-                            src_crs=src.crs,
-                            dst_transform=transform.from_origin(
-                                dst.transform[0],
-                                dst.transform[3],
-                                dst.transform[1],
-                                dst.transform[1],
-                            ),
-                            dst_crs=dst.crs,
-                            resampling=RESAMPLING.nearest,
-                        )
+                reproject(
+                    source=rasterio.band(src, 1),
+                    destination=rasterio.band(dst, 1),
+                    src_transform=src.transform,
+                    src_crs=src.crs,
+                    dst_transform=affine,
+                    dst_crs=out_proj,
+                    resampling=RESAMPLING[resamp_type],
+                    num_threads=os.cpu_count(),
+                    warp_mem_limit=512,
+                )
 
 
 ##############################################################################
@@ -682,39 +856,30 @@ def PointInPoly(points, vpu, catchments, pct_full, mask_dir, appendMetric, summa
             how="left",
         )
 
-    # Get list of lat/long fields in the table
-    points["latlon_tuple"] = tuple(
-        zip(
-            points.geometry.map(lambda point: point.x),
-            points.geometry.map(lambda point: point.y),
-        )
+    # Group duplicate lat/long locations so they're only included once in 'Count'
+    latlon = pd.DataFrame({"x": points.geometry.x, "y": points.geometry.y})
+    # empty or missing geometries fall in no catchment, drop them up front
+    located = latlon.notna().all(axis=1).values
+    points, latlon = points[located], latlon[located]
+    group = latlon.groupby(["x", "y"], sort=False).ngroup().values
+    first = np.unique(group, return_index=True)[1]
+    # Find the catchment(s) that each unique point falls within using one bulk
+    # query of the catchment spatial index, shared by 'Count' and the summaries
+    pt_idx, poly_idx = polys.sindex.query_bulk(
+        points.geometry.values[first], predicate="within"
     )
-    # Remove duplicate points for 'Count'
-    points2 = points.drop_duplicates("latlon_tuple")
-    try:
-        point_poly_join = sjoin(points2, polys, how="left", op="within")
-        fld = "GRIDCODE"
-    except:
-        polys["link"] = np.nan
-        point_poly_join = polys
-        fld = "link"
-    # Create group of all points in catchment
-    grouped = point_poly_join.groupby("FEATUREID")
-    point_poly_count = grouped[fld].count()
-    point_poly_count.name = "COUNT"
-    # Join Count column on to NHDCatchments table and keep only
-    # ['COMID','CatAreaSqKm','CatCount']
-    final = polys.join(point_poly_count, on="FEATUREID", lsuffix="_", how="left")
-    final = final[["FEATUREID", "AreaSqKM", "COUNT"]].fillna(0)
+    final = polys[["FEATUREID", "AreaSqKM"]].fillna(0)
+    # Count points in every catchment, then total by FEATUREID
+    final["COUNT"] = np.bincount(poly_idx, minlength=len(polys))
     cols = ["COMID", f"CatAreaSqKm{appendMetric}", f"CatCount{appendMetric}"]
     if not summary == None:  # Summarize fields including duplicates
-        point_poly_dups = sjoin(points, polys, how="left", op="within")
-        grouped2 = point_poly_dups.groupby("FEATUREID")
         for x in summary:  # Sum the field in summary field list for each catchment
-            point_poly_stats = grouped2[x].sum()
-            point_poly_stats.name = x
-            final = final.join(point_poly_stats, on="FEATUREID", how="left").fillna(0)
+            field = points[x].fillna(0).values
+            weights = np.bincount(group, weights=field, minlength=len(first))[pt_idx]
+            final[x] = np.bincount(poly_idx, weights=weights, minlength=len(polys))
             cols.append("Cat" + x + appendMetric)
+    sums = final.columns[2:]
+    final[sums] = final.groupby("FEATUREID")[sums].transform("sum").astype(float)
     final.columns = cols
     # Merge final table with Pct_Full table based on COMID and fill NA's with 0
     final = pd.merge(final, pct_full, on="COMID", how="left")
@@ -748,7 +913,7 @@ def rat_to_dict(inraster, old_val, new_val):
     __author__ =  "Matt Gregory <matt.gregory@oregonstate.edu>"
                   "Marc Weber <weber.marc@epa.gov>"
 
-    Given a GDAL raster attribute table, convert to a pandas DataFrame.  Idea from
+    Given a GDAL raster attribute table, convert to a lookup dictionary.  Idea from
     Matt Gregory's gist: https://gist.github.com/grovduck/037d815928b2a9fe9516
     Arguments
     ---------
@@ -761,19 +926,15 @@ def rat_to_dict(inraster, old_val, new_val):
     ds = gdal.Open(inraster)
     rb = ds.GetRasterBand(1)
     rat = rb.GetDefaultRAT()
-    # Read in each column from the RAT and convert it to a series infering
-    # data type automatically
-    s = [
-        pd.Series(rat.ReadAsArray(i), name=rat.GetNameOfCol(i))
-        for i in xrange(rat.GetColumnCount())
-    ]
-    # Convert the RAT to a pandas dataframe
-    df = pd.concat(s, axis=1)
+    # Only the two lookup columns are needed, read just those from the RAT
+    names = [rat.GetNameOfCol(i) for i in range(rat.GetColumnCount())]
+    keys = rat.ReadAsArray(names.index(old_val))
+    vals = rat.ReadAsArray(names.index(new_val))
     # Close the dataset
     ds = None
 
     # Write out the lookup dictionary
-    reclass_dict = pd.Series(df[new_val].values, index=df[old_val]).to_dict()
+    reclass_dict = dict(zip(keys.tolist(), vals.tolist()))
     return reclass_dict
 
 
@@ -803,31 +964,30 @@ def interVPU(tbl, cols, accum_type, zone, Connector, interVPUtbl):
 
     # COMIDs in the toCOMID column need to swap values with COMIDs in other
     # zones, those COMIDS are then sorted in toVPUS
-    if any(interVPUtbl.toCOMIDs.values > 0):
+    to_other_zone = any(interVPUtbl.toCOMIDs.values > 0)
+    if to_other_zone:
         interAlloc = "%s_%s.csv" % (
             Connector[: Connector.find("_connectors")],
             interVPUtbl.ToZone.values[0],
         )
         tbl = pd.read_csv(interAlloc).set_index("COMID")
         toVPUs = tbl[tbl.index.isin([x for x in interVPUtbl.toCOMIDs if x > 0])].copy()
-    for _, row in interVPUtbl.iterrows():
+    drop_ids = []
+    for row in interVPUtbl.itertuples(index=False):
         # Loop through sub-setted interVPUtbl to make adjustments to COMIDS listed in the table
         if row.toCOMIDs > 0:
             AdjustCOMs(toVPUs, int(row.toCOMIDs), int(row.thruCOMIDs), throughVPUs)
         if row.AdjustComs > 0:
             AdjustCOMs(throughVPUs, int(row.AdjustComs), int(row.thruCOMIDs), None)
         if row.DropCOMID > 0:
-            throughVPUs = throughVPUs.drop(int(row.DropCOMID))
-    if any(interVPUtbl.toCOMIDs.values > 0):
-        con = pd.read_csv(Connector).set_index("COMID")
-        con.columns = map(str, con.columns)
-        toVPUs = pd.concat([toVPUs,con], axis=0, ignore_index=False)
-        toVPUs.to_csv(Connector)
+            drop_ids.append(int(row.DropCOMID))
+    throughVPUs = throughVPUs.drop(drop_ids)
+    con = None
     if os.path.exists(Connector):  # if Connector already exists, read it in and append
         con = pd.read_csv(Connector).set_index("COMID")
-        con.columns = map(str, con.columns)
-        throughVPUs = pd.concat([throughVPUs, con], axis=0, ignore_index=False) 
-    throughVPUs.to_csv(Connector)
+        con.columns = con.columns.astype(str)
+    out = [throughVPUs, toVPUs, con] if to_other_zone else [throughVPUs, con]
+    pd.concat(out, axis=0, ignore_index=False).to_csv(Connector)
 
 
 ##############################################################################
@@ -847,15 +1007,87 @@ def AdjustCOMs(tbl, comid1, comid2, tbl2=None):
     """
 
     if tbl2 is None:  # might be able to fix this in the arguments
-        tbl2 = tbl.copy()
-    for idx in tbl.columns[:-1]:
-        tbl.loc[comid1, idx] = tbl.loc[comid1, idx] - tbl2.loc[comid2, idx]
+        tbl2 = tbl
+    cols = tbl.columns[:-1]
+    # subtract the whole row at once, the right side is evaluated before
+    # assignment so no copy of tbl is needed when comid2 is also in tbl
+    tbl.loc[comid1, cols] = (
+        tbl.loc[comid1, cols].to_numpy() - tbl2.loc[comid2, cols].to_numpy()
+    )
 
 
 ##############################################################################
 
 
-def Accumulation(tbl, comids, lengths, upstream, tbl_type, icol="COMID"):
+def _pad(d, value):
+    """
+    Appends a row of `value` to the 2D array so that the offset of a trailing
+    COMID without any upstream values is still in bounds for `reduceat`.
+    """
+    return np.concatenate([d, np.full((1, d.shape[1]), value, dtype=d.dtype)])
+
+
+def _accum_sum(d, starts, empty):
+    """
+    Sums the upstream values for each COMID, ignoring NaNs.
+
+    Arguments
+    ---------
+    d                     : 2D numpy array of upstream values, one column per metric
+    starts                : numpy array of offsets where each COMID's upstream values begin in `d`
+    empty                 : boolean numpy array flagging COMIDs without any upstream values
+    """
+    out = np.add.reduceat(
+        _pad(np.where(np.isnan(d), 0, d), 0), starts, dtype=np.float64
+    )
+    out[empty] = 0
+    return out
+
+
+def _accum_wavg(d, ar, starts, empty):
+    """
+    Returns the numerator and denominator of the area-weighted average of the
+    upstream values for each COMID, NaN values are counted as 0.
+
+    Arguments
+    ---------
+    d                     : 2D numpy array of upstream values, one column per metric
+    ar                    : numpy array of upstream areas used as weights, aligned with `d`
+    starts                : numpy array of offsets where each COMID's upstream values begin in `d`
+    empty                 : boolean numpy array flagging COMIDs without any upstream values
+    """
+    # weight in float64, products of float32 values and areas lose precision
+    d = np.where(np.isnan(d), 0, d).astype(np.float64)
+    num = np.add.reduceat(_pad(d * ar[:, None], 0), starts)
+    den = np.add.reduceat(np.append(ar, 0), starts, dtype=np.float64)
+    num[empty], den[empty] = 0, 0
+    return num, den
+
+
+def _accum_extreme(d, starts, empty, func, initial):
+    """
+    Returns the max or min of the upstream values for each COMID, bounded by
+    `initial` the same way as `np.max(..., initial=initial)`.
+
+    Arguments
+    ---------
+    d                     : 2D numpy array of upstream values, one column per metric
+    starts                : numpy array of offsets where each COMID's upstream values begin in `d`
+    empty                 : boolean numpy array flagging COMIDs without any upstream values
+    func                  : either np.maximum or np.minimum
+    initial               : value returned for COMIDs without any upstream values
+    """
+    out = func.reduceat(_pad(d, initial), starts)
+    out[empty] = initial
+    return func(out, initial)
+
+
+##############################################################################
+
+
+def Accumulation(
+    tbl, comids, lengths, upstream, tbl_type, icol="COMID", indices=None
+):
     """
     __author__ =  "Ryan Hill <hill.ryan@epa.gov>"
                   "Marc Weber <weber.marc@epa.gov>"
@@ -871,52 +1103,75 @@ def Accumulation(tbl, comids, lengths, upstream, tbl_type, icol="COMID"):
     upstream              : numpy array of all upstream arrays for each COMID
     tbl_type              : string value of table metrics to be returned
     icol                  : column in arr object to index
+    indices               : swapper(coms, upstream) output to reuse between the 'Up' and 'Ws' calls
     """
     # RuntimeWarning: invalid value encountered in double_scalars
     np.seterr(all="ignore")
     coms = tbl[icol].values.astype("int32")  # Read in comids
-    indices = swapper(coms, upstream)  # Get indices that will be used to map values
+    # only accumulate the comids found in the table, the rest would be dropped
+    keep = np.isin(comids, coms, assume_unique=True)
+    flat_keep = np.repeat(keep, lengths)
+    # Get indices that will be used to map values
+    if indices is None:
+        indices = swapper(coms, upstream[flat_keep])
+    else:
+        indices = indices[flat_keep]
+    indices = indices.astype(np.int32)
     del upstream  # a and indices are big - clean up to minimize RAM
     cols = tbl.columns[1:]  # Get column names that will be accumulated
-    z = np.zeros(comids.shape)  # Make empty vector for placing values
-    data = np.zeros((len(comids), len(tbl.columns)))
-    data[:, 0] = comids  # Define first column as comids
-    accumulated_indexes = np.add.accumulate(lengths)[:-1]
-    # Loop and accumulate values
-    for index, column in enumerate(cols, 1):
-        col_values = tbl[column].values.astype("float")
-        all_values = np.split(col_values[indices], accumulated_indexes)
-        if tbl_type == "Ws":
-            # add identity value to each array for full watershed
-            all_values = np.array(
-                [np.append(val, col_values[idx]) for idx, val in enumerate(all_values)],
-                dtype=object,
-            )
-
-            # all_values = [np.append(val, col_values[idx]) for idx, val in enumerate(all_values)]
-
-        if index == 1:
-            area = all_values.copy()
-        if "PctFull" in column:
-            values = [
-                np.ma.average(np.nan_to_num(val), weights=w)
-                for val, w in zip(all_values, area)
-            ]
-        elif "MIN" in column or "MAX" in column:
-            func = np.max if "MAX" in column else np.min
-            # initial is necessary to eval empty upstream arrays
-            # these values will be overwritten w/ nan later
-
-            # initial = -999 if "MAX" in column else 999999
-
-            initial = -999999 if "MAX" in column else 999999
-
-            values = np.array([func(val, initial=initial) for val in all_values])
-            values[lengths == 0] = col_values[lengths == 0]
-        else:
-            values = np.array([np.nansum(val) for val in all_values])
-        data[:, index] = values
-    data = data[np.in1d(data[:, 0], coms), :]  # Remove the extra comids
+    lengths = lengths[keep]
+    data = np.zeros((len(lengths), len(tbl.columns)))
+    data[:, 0] = comids[keep]  # Define first column as comids
+    # offsets of each COMID's upstream run in the flat arrays, reused by every column
+    starts = np.append(0, np.add.accumulate(lengths)[:-1])
+    empty = lengths == 0
+    # gather in float32 to halve memory traffic, the reductions accumulate in float64
+    vals = tbl[cols].to_numpy(dtype=np.float32)
+    own_values = vals[: len(comids)][keep]
+    area, own_area = vals[indices, 0], own_values[:, 0].astype(np.float64)
+    is_wavg = cols.str.contains("PctFull")
+    is_max = cols.str.contains("MAX") & ~is_wavg
+    is_min = cols.str.contains("MIN") & ~is_wavg & ~is_max
+    is_sum = ~(is_wavg | is_max | is_min)
+    # MIN/MAX pick an input value rather than add them up, so they're gathered
+    # from float64 to come out exactly as the inputs
+    exact = tbl[cols[is_max | is_min]].to_numpy(dtype=np.float64)
+    exact_own = exact[: len(comids)][keep]
+    exact_pos = np.cumsum(is_max | is_min) - 1
+    # gather upstream values for a block of columns at a time, one pass over
+    # indices per block while keeping the 2D gather to ~256MB
+    step = max(1, 2**25 // max(len(indices), 1))
+    for first in range(0, len(cols), step):
+        block = slice(first, first + step)
+        up, own = vals[indices, block], own_values[:, block]
+        out = data[:, 1 + first : 1 + first + step]
+        wavg, sums = is_wavg[block], is_sum[block]
+        if sums.any():
+            out[:, sums] = _accum_sum(up[:, sums], starts, empty)
+            if tbl_type == "Ws":
+                # add identity value to each sum for full watershed
+                out[:, sums] += np.where(np.isnan(own[:, sums]), 0, own[:, sums])
+        if wavg.any():
+            num, den = _accum_wavg(up[:, wavg], area, starts, empty)
+            if tbl_type == "Ws":
+                own_wavg = np.where(np.isnan(own[:, wavg]), 0, own[:, wavg])
+                num += own_wavg * own_area[:, None]
+                den += own_area
+            out[:, wavg] = num / den[:, None]
+        # initial is necessary to eval empty upstream arrays
+        # these values will be overwritten w/ nan later
+        for ext, func, initial in (
+            (is_max[block], np.maximum, -999999),
+            (is_min[block], np.minimum, 999999),
+        ):
+            if ext.any():
+                pos = exact_pos[block][ext]
+                up_ext, own_ext = exact[np.ix_(indices, pos)], exact_own[:, pos]
+                values = _accum_extreme(up_ext, starts, empty, func, initial)
+                if tbl_type == "Ws":
+                    values = func(values, own_ext)
+                values[empty] = own_ext[empty]
+                out[:, ext] = values
     outDF = pd.DataFrame(data)
     prefix = "UpCat" if tbl_type == "Up" else "Ws"
     outDF.columns = [icol] + [c.replace("Cat", prefix) for c in cols.tolist()]
@@ -932,6 +1187,230 @@ def Accumulation(tbl, comids, lengths, upstream, tbl_type, icol="COMID"):
 ##############################################################################
 
 
+def _path_key(path):
+    """
+    Returns a file name safe hash of the absolute path to a file, used to name
+    the copies of it kept in a cache directory.
+    """
+    return hashlib.md5(os.path.abspath(path).encode()).hexdigest()
+
+
+def _atomic_write(out, write):
+    """
+    Calls `write` with a temporary path next to `out`, then moves the finished
+    file into place so an interrupted write never leaves a partial `out`.
+
+    Arguments
+    ---------
+    out                   : string to the file to write
+    write                 : function writing the file to the path it is given
+    """
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    root, ext = os.path.splitext(out)
+    tmp = f"{root}.{os.getpid()}.tmp{ext}"
+    try:
+        write(tmp)
+        os.replace(tmp, out)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _raster_signature(inRaster):
+    """
+    Returns a hash of the size and modification time of every file making up
+    a raster. An ESRI GRID is a directory whose mtime doesn't change when the
+    files in it are rewritten, so each of its files is checked.
+
+    Arguments
+    ---------
+    inRaster              : string to a raster file or ESRI GRID directory
+    """
+    files = [inRaster]
+    if os.path.isdir(inRaster):
+        files = sorted(
+            os.path.join(root, f) for root, _, fs in os.walk(inRaster) for f in fs
+        )
+    sig = hashlib.md5()
+    for f in files:
+        stat = os.stat(f)
+        sig.update(f"{f}|{stat.st_size}|{stat.st_mtime_ns};".encode())
+    return sig.hexdigest()
+
+
+def _cache_zone_raster(inZoneData, cache_dir, rows=1024):
+    """
+    Decodes the zone raster once into an uncompressed .npy file in
+    `cache_dir` and returns it memory-mapped, so each landscape layer summarized
+    over the same zones reads plain pixels rather than decoding the grid again.
+    The cache is keyed on the files of the zone raster and rebuilt when they
+    change, replacing the older copy.
+
+    Arguments
+    ---------
+    inZoneData            : string to the zone raster, i.e. the NHD catchment grid
+    cache_dir             : string to the directory holding the cached arrays
+    rows                  : number of zone raster rows copied at a time
+    """
+    key = _path_key(inZoneData)
+    out = f"{cache_dir}/{key}_{_raster_signature(inZoneData)}.npy"
+    if not os.path.exists(out):
+
+        def write(tmp):
+            with rasterio.open(inZoneData) as z:
+                arr = np.lib.format.open_memmap(
+                    tmp, mode="w+", dtype=z.dtypes[0], shape=z.shape
+                )
+                for row in range(0, z.height, rows):
+                    win = Window(0, row, z.width, min(rows, z.height - row))
+                    arr[row : row + win.height] = z.read(1, window=win)
+                arr.flush()
+                del arr
+
+        _atomic_write(out, write)
+        # drop copies of earlier versions of this raster
+        for old in os.listdir(cache_dir):
+            stale = f"{cache_dir}/{old}"
+            if old.startswith(f"{key}_") and ".tmp." not in old and stale != out:
+                try:
+                    os.remove(stale)
+                except OSError:  # i.e. still mapped by another process
+                    pass
+    return np.load(out, mmap_mode="r")
+
+
+def zonal_stats(
+    inZoneData, LandscapeLayers, pixels=2**23, cache_dir=None, minmax=False
+):
+    """
+    Summarizes continuous rasters within each zone of the zone raster, the
+    same statistics as ZonalStatisticsAsTable w/ "DATA" (NoData ignored) but
+    computed in-process. The zone raster is read in strips of rows and the
+    matching window of each landscape raster is read onto the zone grid w/
+    nearest neighbor, so each strip is reduced with `np.bincount`. Passing
+    several landscape rasters summarizes all of them in one pass over the
+    zone raster.
+
+    Arguments
+    ---------
+    inZoneData            : string to the zone raster, i.e. the NHD catchment grid
+    LandscapeLayers       : string of the landscape raster name, or a list of them
+    pixels                : number of zone raster cells read at a time, sets the rows in a strip
+    cache_dir             : string to a directory to cache the decoded zone raster in, no cache if None
+    minmax                : also return MIN and MAX, these need a sort of every strip
+
+    Returns
+    ---------
+    pd.DataFrame | list
+        VALUE, COUNT, AREA, MEAN and SUM (and MIN, MAX) of every zone w/ data,
+        a list of these tables in the same order if a list of rasters is given
+    """
+    layers = [LandscapeLayers] if isinstance(LandscapeLayers, str) else LandscapeLayers
+    count = np.zeros((len(layers), 0), np.int64)
+    total = np.zeros((len(layers), 0), np.float64)
+    low, high = np.zeros_like(total), np.zeros_like(total)
+    zones = _cache_zone_raster(inZoneData, cache_dir) if cache_dir else None
+    with rasterio.open(inZoneData) as z:
+        sources = [rasterio.open(lyr) for lyr in layers]
+        try:
+            # windows are matched by bounds, nothing is projected on the fly
+            for lyr, v in zip(layers, sources):
+                if v.crs != z.crs:
+                    raise ValueError(
+                        f"{lyr} is not in the CRS of {inZoneData}, project it first"
+                    )
+            # size strips by cells so wide grids don't blow up the temporaries
+            rows = max(1, pixels // z.width)
+            for row in range(0, z.height, rows):
+                win = Window(0, row, z.width, min(rows, z.height - row))
+                if zones is None:
+                    zblk = z.read(1, window=win)
+                else:
+                    zblk = np.asarray(zones[row : row + win.height])
+                bounds = z.window_bounds(win)
+                for k, v in enumerate(sources):
+                    vblk = v.read(
+                        1,
+                        window=from_bounds(*bounds, transform=v.transform),
+                        out_shape=zblk.shape,
+                        boundless=True,
+                        masked=True,
+                        resampling=RESAMPLING.nearest,
+                    )
+                    valid = ~np.ma.getmaskarray(vblk)
+                    vblk = vblk.data.astype(np.float64)
+                    valid &= ~np.isnan(vblk)
+                    if z.nodata is not None:
+                        valid &= zblk != z.nodata
+                    ids, vals = zblk[valid].astype(np.int64), vblk[valid]
+                    if not len(ids):
+                        continue
+                    size = max(ids.max() + 1, count.shape[1])
+                    if size > count.shape[1]:  # grow to hold the largest zone id
+                        grow = ((0, 0), (0, size - count.shape[1]))
+                        count = np.pad(count, grow)
+                        total = np.pad(total, grow)
+                        low = np.pad(low, grow, constant_values=np.inf)
+                        high = np.pad(high, grow, constant_values=-np.inf)
+                    count[k] += np.bincount(ids, minlength=size)
+                    total[k] += np.bincount(ids, weights=vals, minlength=size)
+                    if not minmax:
+                        continue
+                    # min/max of each zone in the strip from runs of the sorted ids
+                    order = np.argsort(ids, kind="stable")
+                    ids, vals = ids[order], vals[order]
+                    uniq, starts = np.unique(ids, return_index=True)
+                    mn, mx = low[k], high[k]
+                    mn[uniq] = np.minimum(mn[uniq], np.minimum.reduceat(vals, starts))
+                    mx[uniq] = np.maximum(mx[uniq], np.maximum.reduceat(vals, starts))
+        finally:
+            for v in sources:
+                v.close()
+        cell_area = abs(z.transform.a * z.transform.e)
+    tables = []
+    for k in range(len(layers)):
+        found = np.flatnonzero(count[k])
+        table = pd.DataFrame(
+            {
+                "VALUE": found,
+                "COUNT": count[k, found],
+                "AREA": count[k, found] * cell_area,
+                "MEAN": total[k, found] / count[k, found],
+                "SUM": total[k, found],
+            }
+        )
+        if minmax:
+            table.insert(3, "MIN", low[k, found])
+            table.insert(4, "MAX", high[k, found])
+        tables.append(table)
+    return tables[0] if isinstance(LandscapeLayers, str) else tables
+
+
+##############################################################################
+
+
+_ARCPY_INITED = False
+
+
+def _init_arcpy_env():
+    """
+    Checks out the Spatial Analyst license and applies the arcpy environment
+    settings shared by every zone, once per process. `snapRaster` changes
+    with each zone so it is left to the caller.
+    """
+    global _ARCPY_INITED
+    if _ARCPY_INITED:
+        return
+    if arcpy.CheckExtension("Spatial") != "Available":
+        raise LicenseError
+    arcpy.CheckOutExtension("Spatial")
+    arcpy.env.cellSize = "30"
+    _ARCPY_INITED = True
+
+
+##############################################################################
+
+
 def createCatStats(
     accum_type,
     LandscapeLayer,
@@ -943,12 +1422,13 @@ def createCatStats(
     NHD_dir,
     hydroregion,
     appendMetric,
+    zone_cache_dir=None,
 ):
 
     """
     __author__ =  "Marc Weber <weber.marc@epa.gov>"
                   "Ryan Hill <hill.ryan@epa.gov>"
-    Uses the arcpy tools to perform ZonalStatisticsAsTable or TabulateArea based on accum_type and then formats
+    Uses `zonal_stats` or the arcpy TabulateArea tool based on accum_type and then formats
     the results into a Catchment Results table with 'PctFull'Calculated
 
     Arguments
@@ -958,11 +1438,10 @@ def createCatStats(
     inZoneData            : string to the NHD catchment grid
     out_dir               : string to directory where output is being stored
     zone                  : string of an NHDPlusV2 VPU zone, i.e. 10L, 16, 17
+    zone_cache_dir        : directory to cache decoded zone rasters in for `zonal_stats`, none kept if None
     """
 
     try:
-        arcpy.env.cellSize = "30"
-        arcpy.env.snapRaster = inZoneData
         if by_RPU == 0:
             if LandscapeLayer.count(".tif") or LandscapeLayer.count(".img"):
                 outTable = "%s/DBF_stash/zonalstats_%s%s%s.dbf" % (
@@ -978,70 +1457,98 @@ def createCatStats(
                     appendMetric,
                     zone,
                 )
-            if not os.path.exists(outTable):
-                if accum_type == "Categorical":
+            if accum_type == "Continuous" and not os.path.exists(outTable):
+                # summarize in-process instead of a round trip through a dbf
+                table = zonal_stats(
+                    inZoneData, LandscapeLayer, cache_dir=zone_cache_dir
+                )
+            else:
+                if not os.path.exists(outTable):
+                    # TabulateArea is the only step left that needs arcpy
+                    _init_arcpy_env()
+                    arcpy.env.snapRaster = inZoneData
                     TabulateArea(
                         inZoneData, "VALUE", LandscapeLayer, "Value", outTable, "30"
                     )
-                if accum_type == "Continuous":
-                    ZonalStatisticsAsTable(
-                        inZoneData, "VALUE", LandscapeLayer, outTable, "DATA", "ALL"
-                    )
-            try:
-                table = dbf2DF(outTable)
-            except fiona.errors.DriverError as e:
-                # arc occassionally doesn't release the file and fails here
-                print(e, "\n\n!EXCEPTION CAUGHT! TRYING AGAIN!")
-                time.sleep(60)
-                table = dbf2DF(outTable)
+                try:
+                    table = dbf2DF(outTable)
+                except (OSError, ValueError, struct.error) as e:
+                    # arc occassionally doesn't release the file and fails here,
+                    # a locked file can't be opened and a partial one won't parse
+                    print(e, "\n\n!EXCEPTION CAUGHT! TRYING AGAIN!")
+                    time.sleep(60)
+                    table = dbf2DF(outTable)
         if by_RPU == 1:
             hydrodir = "/".join(inZoneData.split("/")[:-2]) + "/NEDSnapshot"
-            rpuList = []
+            rpuList, tables, missing = [], {}, {}
             for subdirs in os.listdir(hydrodir):
                 elev = "%s/%s/elev_cm" % (hydrodir, subdirs)
-                rpuList.append(subdirs[-3:])
-                print("working on " + elev)
-                outTable = out_dir + "/DBF_stash/zonalstats_elev%s.dbf" % (subdirs[-3:])
-                if not os.path.exists(outTable):
-                    ZonalStatisticsAsTable(
-                        inZoneData, "VALUE", elev, outTable, "DATA", "ALL"
-                    )
-            for count, rpu in enumerate(rpuList):
-                if count == 0:
-                    table = dbf2DF(f"{out_dir}/DBF_stash/zonalstats_elev{rpu}.dbf")
+                rpu = subdirs[-3:]
+                rpuList.append(rpu)
+                outTable = out_dir + "/DBF_stash/zonalstats_elev%s.dbf" % (rpu)
+                if os.path.exists(outTable):
+                    tables[rpu] = dbf2DF(outTable)
                 else:
-                    table = pd.concat(
-                        [
-                            table,
-                            dbf2DF(f"{out_dir}/DBF_stash/zonalstats_elev{rpu}.dbf"),
-                        ]
-                    )
+                    missing[rpu] = elev
+            # summarize every remaining RPU raster in one pass over the zones
+            if missing:
+                print("working on " + ", ".join(missing.values()))
+                stats = zonal_stats(
+                    inZoneData,
+                    list(missing.values()),
+                    cache_dir=zone_cache_dir,
+                    minmax=True,
+                )
+                tables.update(zip(missing, stats))
+            table = pd.concat([tables[rpu] for rpu in rpuList], ignore_index=True)
             if len(rpuList) > 1:
-                table.reset_index(drop=True, inplace=True)
-                table = table.loc[table.groupby("VALUE").AREA.idxmax()]
+                # keep the row w/ the largest AREA for VALUEs split across RPUs
+                idx = table.groupby("VALUE", sort=False)["AREA"].idxmax()
+                table = table.loc[idx.values].reset_index(drop=True)
     except LicenseError:
         print("Spatial Analyst license is unavailable")
+        raise
     except arcpy.ExecuteError:
         print("Failing at the ExecuteError!")
         print(arcpy.GetMessages(2))
 
     if mask_dir:
-        nhdtbl = dbf2DF(
+        # read only the needed columns, Parquet copy is shared with later runs
+        nhdtbl = _read_dbf_cached(
             f"{NHD_dir}/NHDPlus{hydroregion}/NHDPlus{zone}"
-            "/NHDPlusCatchment/Catchment.dbf"
-        ).loc[:, ["FEATUREID", "AREASQKM", "GRIDCODE"]]
-        tbl = dbf2DF(outTable)
+            "/NHDPlusCatchment/Catchment.dbf",
+            ("FEATUREID", "GRIDCODE"),
+            f"{out_dir}/dbf_cache",
+        )
+        tbl = table
         if accum_type == "Categorical":
             tbl = chkColumnLength(tbl, LandscapeLayer)
+        if accum_type == "Continuous":
+            # prune the zonal stats to what's used below before joining
+            tbl = tbl[["VALUE", "COUNT", "SUM"]]
         # We need to use the raster attribute table here for PctFull & Area
         # TODO: this needs to be considered when making masks!!!
-        tbl2 = dbf2DF(f"{mask_dir}/{zone}.tif.vat.dbf")
+        tbl2 = dbf2DF(f"{mask_dir}/{zone}.tif.vat.dbf")[["VALUE", "COUNT"]]
         tbl2 = (
-            pd.merge(tbl2, nhdtbl, how="right", left_on="VALUE", right_on="GRIDCODE")
+            pd.merge(
+                tbl2,
+                nhdtbl,
+                how="right",
+                left_on="VALUE",
+                right_on="GRIDCODE",
+                validate="one_to_one",
+            )
             .fillna(0)
             .drop("VALUE", axis=1)
         )
-        result = pd.merge(tbl2, tbl, left_on="GRIDCODE", right_on="VALUE", how="left")
+        result = pd.merge(
+            tbl2,
+            tbl,
+            left_on="GRIDCODE",
+            right_on="VALUE",
+            how="left",
+            validate="one_to_one",
+        )
         if accum_type == "Continuous":
             result["PctFull%s" % appendMetric] = (result.COUNT_y / result.COUNT_x) * 100
             result["AreaSqKm%s" % appendMetric] = (result.COUNT_x * 900) * 1e-6
@@ -1066,7 +1573,9 @@ def createCatStats(
                 "PctFull%s" % appendMetric,
             ]
         if accum_type == "Categorical":
-            result["TotCount"] = result[tbl.columns.tolist()[1:]].sum(axis=1)
+            # reduce the VALUE_* columns as one 2D array, not row-wise in pandas
+            value_cols = result[tbl.columns.tolist()[1:]].to_numpy(dtype=np.float64)
+            result["TotCount"] = np.nansum(value_cols, axis=1)
             result["PctFull%s" % appendMetric] = (
                 result.TotCount / (result.COUNT * 900)
             ) * 100
@@ -1091,15 +1600,19 @@ def createCatStats(
             table = table.rename(columns={"COUNT": "Count", "SUM": "Sum"})
         if accum_type == "Categorical":
             table = chkColumnLength(table, LandscapeLayer)
-            table["AREA"] = table[table.columns.tolist()[1:]].sum(axis=1)
-        nhdTable = dbf2DF(inZoneData[:-3] + "Catchment.dbf").loc[
-            :, ["FEATUREID", "AREASQKM", "GRIDCODE"]
-        ]
+            value_cols = table[table.columns.tolist()[1:]].to_numpy(dtype=np.float64)
+            table["AREA"] = np.nansum(value_cols, axis=1)
+        nhdTable = _read_dbf_cached(
+            inZoneData[:-3] + "Catchment.dbf",
+            ("FEATUREID", "AREASQKM", "GRIDCODE"),
+            f"{out_dir}/dbf_cache",
+        )
         nhdTable = nhdTable.rename(
             columns={"FEATUREID": "COMID", "AREASQKM": "AreaSqKm"}
         )
-        result = pd.merge(
-            nhdTable, table, how="left", left_on="GRIDCODE", right_on="VALUE"
+        # join on the index, GRIDCODE is dropped from the result below anyway
+        result = nhdTable.set_index("GRIDCODE").join(
+            table.set_index("VALUE"), how="left", validate="many_to_one"
         )
         if LandscapeLayer.split("/")[-1].split(".")[0] == "rdstcrs":
             slptbl = dbf2DF(
@@ -1107,14 +1620,16 @@ def createCatStats(
                 % (NHD_dir, hydroregion, zone)
             ).loc[:, ["COMID", "SLOPE"]]
             slptbl.loc[slptbl["SLOPE"] == -9998.0, "SLOPE"] = 0
-            result = pd.merge(result, slptbl, on="COMID", how="left")
+            result = pd.merge(
+                result, slptbl, on="COMID", how="left", validate="one_to_one"
+            )
             result.SLOPE = result.SLOPE.fillna(0)
             result["SlpWtd"] = result["Sum"] * result["SLOPE"]
             result = result.drop(["SLOPE"], axis=1)
         result["PctFull"] = (
             ((result.AREA * 1e-6) / result.AreaSqKm.astype("float")) * 100
         ).fillna(0)
-        result = result.drop(["GRIDCODE", "VALUE", "AREA"], axis=1)
+        result = result.drop("AREA", axis=1).reset_index(drop=True)
     cols = result.columns[1:]
     result.columns = np.append("COMID", "Cat" + cols.values)
     return result  # ALL NAs need to be filled w/ zero here for Accumulation!!
@@ -1188,16 +1703,12 @@ def chkColumnLength(table, landscape_layer):
         rat_cols = dbf2DF(rat_file).VALUE.tolist()
     tbl_cols = table.columns.tolist()
     tbl_cols.sort(key=len)  # sort() is done in place on a list -- returns None
-    table, val_cols = table[tbl_cols], tbl_cols[1:]
     rat_cols = [f"VALUE_{x}" for x in rat_cols]  # align ints w/ strs
-    missing = list(set(rat_cols).difference(set(tbl_cols)))
-    if missing:
-        missing.sort()
-        missing.sort(key=len)
-        for col in missing:
-            idx = rat_cols.index(col)
-            table.insert(idx + 1, col, 0)  # add 1 to shift for VALUE
-    return table
+    # sorting by str and then by len puts the VALUE_<int> columns in int order
+    ordered = sorted(set(rat_cols).union(tbl_cols[1:]))
+    ordered.sort(key=len)
+    # add the missing columns filled with zeros in one allocation
+    return table.reindex(columns=[tbl_cols[0]] + ordered, fill_value=0)
 
 
 def appendConnectors(cat, Connector, zone, interVPUtbl):
@@ -1214,26 +1725,15 @@ def appendConnectors(cat, Connector, zone, interVPUtbl):
     interVPUtbl           : table of interVPU adjustments
     """
     con = pd.read_csv(Connector)
-    for comidx in con.COMID.values.astype(int):
-        if comidx in cat.COMID.values.astype(int):
-            cat = cat.drop(cat[cat.COMID == comidx].index)
-    con = con.loc[
-        con.COMID.isin(
-            np.append(
-                interVPUtbl.loc[interVPUtbl.ToZone.values == zone].thruCOMIDs.values,
-                interVPUtbl.loc[interVPUtbl.ToZone.values == zone].toCOMIDs.values[
-                    np.nonzero(
-                        interVPUtbl.loc[
-                            interVPUtbl.ToZone.values == zone
-                        ].toCOMIDs.values
-                    )
-                ],
-            )
-        )
-    ]
-
-    cat = pd.concat([cat, con], axis=0, ignore_index=False)   
-    return cat.reset_index(drop=True)
+    # drop every cat row replaced by a connector in one vectorized pass
+    cat_ids = cat.COMID.to_numpy(dtype=np.int64)
+    con_ids = con.COMID.to_numpy(dtype=np.int64)
+    cat = cat.iloc[~np.isin(cat_ids, con_ids)]
+    zmask = interVPUtbl.ToZone.values == zone
+    to_ids = interVPUtbl.toCOMIDs.values[zmask]
+    keep_ids = np.append(interVPUtbl.thruCOMIDs.values[zmask], to_ids[to_ids != 0])
+    con = con.loc[con.COMID.isin(keep_ids)]
+    return pd.concat([cat, con], axis=0, ignore_index=True)
 
 
 ##############################################################################
@@ -1250,27 +1750,86 @@ def swapper(coms, upStream):
     coms                  : numpy array of all COMIDs in the zone
     upstream              : numpy array of all upstream COMIDs for each local catchment
     """
-    bsort = np.argsort(coms)
-    apos = np.searchsorted(coms[bsort], upStream)
-    indices = bsort[apos]
+    coms, upStream = coms.astype(np.int64), upStream.astype(np.int64)
+    lo, hi = coms.min(), coms.max()
+    if hi - lo < 4 * len(coms):
+        # COMIDs are dense enough to index a lookup table directly
+        lut = np.zeros(hi - lo + 1, dtype=np.int64)
+        lut[coms - lo] = np.arange(len(coms))
+        indices = lut[np.clip(upStream - lo, 0, hi - lo)]
+    else:
+        bsort = np.argsort(coms)
+        apos = np.searchsorted(coms[bsort], upStream)
+        indices = bsort[np.minimum(apos, len(coms) - 1)]
+    missing = coms[indices] != upStream
+    if missing.any():
+        # the positions found for these would point at other catchments
+        raise ValueError(
+            f"{missing.sum()} upstream COMIDs not found in table, i.e. "
+            f"{upStream[missing][:5].tolist()}, rebuild `accum_npy`"
+        )
     return indices
 
 
 ##############################################################################
 def make_all_cat_comids(nhd, inputs):
     print("Making allFLOWCOMs numpy file, reading zones...", end="", flush=True)
-    all_comids = np.array([], dtype=np.int32)
+    parts = []
     for zone, hr in inputs.items():
         print(zone, end=", ", flush=True)
         pre = f"{nhd}/NHDPlus{hr}/NHDPlus{zone}"
-        cats = dbf2DF(f"{pre}/NHDPlusCatchment/Catchment.dbf")
-        all_comids = np.append(all_comids, cats.FEATUREID.values.astype(int))
+        parts.append(dbf_column(f"{pre}/NHDPlusCatchment/Catchment.dbf", "FEATUREID"))
+    # join once at the end rather than copying the growing array every zone
+    all_comids = np.concatenate(parts)
     np.savez_compressed("./accum_npy/allCatCOMs.npz", all_comids=all_comids)
     print("...done!")
-    return set(all_comids)  # RETURN A SET!
+    return np.unique(all_comids)  # sorted for the np.isin lookups
+
+
+def _zone_vectors(zone, hr, nhd, inter_tbl, all_comids, cache_dir=None):
+    """
+    Writes the accumulation arrays of a single zone for `makeNumpyVectors`.
+    Kept at the module level so it can be pickled to worker processes.
+
+    Arguments
+    ---------
+    zone        : string of an NHDPlusV2 VPU zone, i.e. 10L, 16, 17
+    hr          : string of the hydroregion the zone is in
+    nhd         : directory where NHD is stored
+    inter_tbl   : table of inter-VPU connections
+    all_comids  : sorted numpy array of every catchment COMID
+    cache_dir   : directory to keep Parquet copies of the NHD tables in
+    """
+    pre = f"{nhd}/NHDPlus{hr}/NHDPlus{zone}"
+    # flow connection dict, w/ IDs from UpCOMadd forced in for the ToZone
+    flow_dict = UpcomDict(pre, inter_tbl, zone, cache_dir)
+    out_of_vpus = inter_tbl.loc[
+        (inter_tbl.ToZone == zone) & (inter_tbl.DropCOMID == 0)
+    ].thruCOMIDs.values
+    comids = dbf_column(f"{pre}/NHDPlusCatchment/Catchment.dbf", "FEATUREID")
+    comids = np.append(comids, out_of_vpus)
+    # flatten the upstream arrays, then filter comids in all_comids with
+    # one lookup over every COMID rather than a set intersection for each
+    upstream = all_upstream(flow_dict, comids)
+    ups = [upstream[x] for x in comids]
+    row = np.repeat(np.arange(len(comids)), [len(u) for u in ups])
+    flat = np.concatenate(ups + [np.array([], dtype=np.int64)])
+    # only keep ids that will have a row in the zone's table, thruCOMIDs w/ a
+    # DropCOMID stay in the flow but are never written to the connector file
+    in_cats = np.isin(flat, comids[np.isin(comids, all_comids)])
+    lengths = np.bincount(row[in_cats], minlength=len(comids))
+    upstream = flat[in_cats].astype(np.int32)  # 1d vector
+    assert len(lengths) == len(comids)
+    np.savez_compressed(
+        f"./accum_npy/accum_{zone}.npz",
+        comids=comids,
+        lengths=lengths,
+        upstream=upstream,
+    )
+    return zone
 
 
-def makeNumpyVectors(inter_tbl, nhd):
+def makeNumpyVectors(inter_tbl, nhd, cache_dir=None, max_workers=2):
     """
     Uses the NHD tables to create arrays of upstream catchments which are used
     in the Accumulation function
@@ -1279,56 +1838,25 @@ def makeNumpyVectors(inter_tbl, nhd):
     ---------
     inter_tbl   : table of inter-VPU connections
     nhd         : directory where NHD is stored
+    cache_dir   : directory to keep Parquet copies of the NHD tables in, i.e. in OUT_DIR
+    max_workers : number of zones built at once, each large zone (10L, 10U, 07)
+                  holds its full upstream arrays in memory
     """
     os.mkdir("accum_npy")
     inputs = nhd_dict(nhd)
     all_comids = make_all_cat_comids(nhd, inputs)
     print("Making numpy files in zone...", end="", flush=True)
-    for zone, hr in inputs.items():
-        print(zone, end=", ", flush=True)
-        pre = f"{nhd}/NHDPlus{hr}/NHDPlus{zone}"
-        flow = dbf2DF(f"{pre}/NHDPlusAttributes/PlusFlow.dbf")[["TOCOMID", "FROMCOMID"]]
-        flow = flow[(flow.TOCOMID != 0) & (flow.FROMCOMID != 0)]
-        fls = dbf2DF(f"{pre}/NHDSnapshot/Hydrography/NHDFlowline.dbf")
-        coastfl = fls.COMID[fls.FTYPE == "Coastline"]
-        flow = flow[~flow.FROMCOMID.isin(coastfl.values)]
-        # remove these FROMCOMIDs from the 'flow' table, there are three COMIDs
-        # here that won't get filtered out any other way
-        flow = flow[~flow.FROMCOMID.isin(inter_tbl.removeCOMs)]
-        # find values that are coming from other zones and remove the ones that
-        # aren't in the interVPU table
-        out = np.setdiff1d(flow.FROMCOMID.values, fls.COMID.values)
-        out = out[
-            np.nonzero(out)
-        ]  # this should be what combines zones and above^, but we force connections with inter_tbl
-        flow = flow[
-            ~flow.FROMCOMID.isin(np.setdiff1d(out, inter_tbl.thruCOMIDs.values))
+    # zones are independent of each other, build them in separate processes
+    workers = max(1, min(len(inputs), os.cpu_count(), max_workers))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = [
+            ex.submit(
+                _zone_vectors, zone, hr, nhd, inter_tbl, all_comids, cache_dir
+            )
+            for zone, hr in inputs.items()
         ]
-        # Table is ready for processing and flow connection dict can be created
-        flow_dict = defaultdict(list)
-        for _, row in flow.iterrows():
-            flow_dict[row.TOCOMID].append(row.FROMCOMID)
-        # add IDs from UpCOMadd column if working in ToZone, forces the flowtable connection though not there
-        for interLine in inter_tbl.values:
-            if interLine[6] > 0 and interLine[2] == zone:
-                flow_dict[int(interLine[6])].append(int(interLine[0]))
-        out_of_vpus = inter_tbl.loc[
-            (inter_tbl.ToZone == zone) & (inter_tbl.DropCOMID == 0)
-        ].thruCOMIDs.values
-        cats = dbf2DF(f"{pre}/NHDPlusCatchment/Catchment.dbf").set_index("FEATUREID")
-        comids = cats.index.values
-        comids = np.append(comids, out_of_vpus)
-        # list of upstream lists, filter comids in all_comids
-        ups = [list(all_comids.intersection(bastards(x, flow_dict))) for x in comids]
-        lengths = np.array([len(u) for u in ups])
-        upstream = np.hstack(ups).astype(np.int32)  # Convert to 1d vector
-        assert len(ups) == len(lengths) == len(comids)
-        np.savez_compressed(
-            f"./accum_npy/accum_{zone}.npz",
-            comids=comids,
-            lengths=lengths,
-            upstream=upstream,
-        )
+        for future in as_completed(futures):
+            print(future.result(), end=", ", flush=True)
 
 
 ##############################################################################
@@ -1402,8 +1930,187 @@ def findUpstreamNpy(zone, com, numpy_dir):
     return upStream[n : n + arrlen]
 
 
+def _read_dbf_cached(f, columns=None, cache_dir=None):
+    """
+    Reads a .dbf and keeps recent tables in memory, keyed by path and
+    modification time. If `cache_dir` is given a Parquet copy of the table is
+    written there on the first read and used by later runs while it is newer
+    than the .dbf. Returned tables are shared between calls, so they must not
+    be modified in place.
+
+    Arguments
+    ---------
+    f               : path to the .dbf file
+    columns         : tuple of (uppercase) column names to read, all if None
+    cache_dir       : string to the directory holding the Parquet copies, i.e. in OUT_DIR
+    """
+    return _read_dbf_columns(f, os.path.getmtime(f), columns, cache_dir)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_dbf_columns(f, mtime, columns, cache_dir):
+    # mtime is only part of the cache key, an edited file is read again
+    cols = None if columns is None else list(columns)
+    if cache_dir is None:
+        data = _read_dbf(f)
+        return data if cols is None else data[cols]
+    pq = f"{cache_dir}/{_path_key(f)}.parquet"
+    if os.path.exists(pq) and os.path.getmtime(pq) >= mtime:
+        return pd.read_parquet(pq, columns=cols)
+    data = _read_dbf(f)
+    _atomic_write(pq, lambda tmp: data.to_parquet(tmp, index=False))
+    return data if cols is None else data[cols]
+
+
 def dbf2DF(f, upper=True):
-    data = gpd.read_file(f).drop("geometry", axis=1)
+    """
+    Reads a dBase table into a DataFrame. Parsed tables are kept in memory
+    keyed by path and modification time, so the same table read again in a
+    later zone is not parsed twice. A shallow copy is returned so callers can
+    add or drop columns without touching the cached table.
+
+    Arguments
+    ---------
+    f               : path to the .dbf file
+    upper           : uppercase the column names
+    """
+    return _dbf2DF_cached(f, os.path.getmtime(f), upper).copy(deep=False)
+
+
+@functools.lru_cache(maxsize=32)
+def _dbf2DF_cached(f, mtime, upper):
+    # mtime is only part of the cache key, an edited file is parsed again
+    return _read_dbf(f, upper)
+
+
+def _cpg_encoding(cpg):
+    """
+    Converts the code page named in a .cpg file to a python codec name, the
+    way GDAL reads them, i.e. "ANSI 1252" or "1252" -> cp1252, "88591" ->
+    iso-8859-1 and "65001" -> utf-8. Unknown names fall back to latin-1.
+
+    Arguments
+    ---------
+    cpg             : text of the .cpg file
+    """
+    name = cpg.strip()
+    code = name.upper()
+    for prefix in ("ANSI", "OEM"):
+        code = code[len(prefix) :].strip() if code.startswith(prefix) else code
+    if code in ("65001", "UTF8"):
+        name = "utf-8"
+    elif code.startswith("8859") and code[4:].isdigit():
+        name = f"iso-8859-{code[4:]}"
+    elif code.isdigit():
+        name = f"cp{code}"
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return "latin-1"
+
+
+def _dbf_records(f):
+    """
+    Reads the records of a dBase table as a numpy structured array of raw
+    bytes, one field per fixed width column.
+
+    Arguments
+    ---------
+    f               : path to the .dbf file
+
+    Returns
+    ---------
+    tuple
+        structured array of records w/ the `_deleted` flag, list of
+        (name, type, size, decimals) for each field and the text encoding
+    """
+    cpg = f"{os.path.splitext(f)[0]}.cpg"
+    encoding = "latin-1"
+    if os.path.exists(cpg):
+        with open(cpg) as src:
+            encoding = _cpg_encoding(src.read())
+    with open(f, "rb") as src:
+        n, header_len, record_len = struct.unpack("<IHH", src.read(32)[4:12])
+        fields = []
+        desc = src.read(32)
+        while desc[:1] != b"\r":
+            if len(desc) < 32:
+                raise ValueError(f"{f} ends inside its header")
+            name = desc[:11].split(b"\0")[0].decode(encoding)
+            fields.append((name, chr(desc[11]), desc[16], desc[17]))
+            desc = src.read(32)
+        src.seek(header_len)
+        buf = src.read(n * record_len)
+    # each record is a deletion flag followed by the fixed width fields
+    layout = np.dtype(
+        {
+            "names": ["_deleted"] + [fld for fld, *_ in fields],
+            "formats": ["S1"] + [f"S{size}" for _, _, size, _ in fields],
+            "itemsize": record_len,
+        }
+    )
+    return np.frombuffer(buf, dtype=layout, count=n), fields, encoding
+
+
+def _dbf_field(col, kind, size, dec, encoding):
+    """
+    Converts the raw bytes of one dBase field to a numpy array.
+    """
+    col = np.char.strip(col)
+    if kind in "NF":
+        null = (col == b"") | np.char.startswith(col, b"*")
+        vals = np.where(null, b"nan", col).astype(np.float64)
+        if kind == "N" and dec == 0 and size < 19 and not null.any():
+            vals = vals.astype(np.int64)
+    elif kind == "L":
+        vals = np.where(
+            np.isin(col, [b"?", b""]), None, np.isin(col, [b"T", b"t", b"Y", b"y"])
+        )
+    elif kind == "D":
+        dates = pd.to_datetime(
+            pd.Series(np.char.decode(col, encoding)),
+            format="%Y%m%d",
+            errors="coerce",
+        )
+        vals = dates.dt.strftime("%Y-%m-%d").where(dates.notnull(), None).values
+    else:
+        vals = np.where(col == b"", None, np.char.decode(col, encoding))
+    return vals
+
+
+def _read_dbf(f, upper=True):
+    """
+    Reads a dBase table into a DataFrame. Records in a .dbf are fixed width,
+    so the file is read in one pass as a numpy structured array and each
+    column is converted as a whole instead of building a record at a time.
+
+    Arguments
+    ---------
+    f               : path to the .dbf file
+    upper           : uppercase the column names
+    """
+    records, fields, encoding = _dbf_records(f)
+    records = records[records["_deleted"] != b"*"]
+    data = {fld: _dbf_field(records[fld], *desc, encoding) for fld, *desc in fields}
+    data = pd.DataFrame(data, columns=[fld for fld, *_ in fields])
     if upper is True:
         data.columns = data.columns.str.upper()
     return data
+
+
+def dbf_column(f, column, dtype=np.int64):
+    """
+    Reads a single column of a dBase table into a numpy array without building
+    a DataFrame of the whole table.
+
+    Arguments
+    ---------
+    f               : path to the .dbf file
+    column          : name of the column to read, case-insensitive
+    dtype           : numpy dtype of the returned array
+    """
+    records, fields, encoding = _dbf_records(f)
+    names = [fld.upper() for fld, *_ in fields]
+    fld, *desc = fields[names.index(column.upper())]
+    col = records[fld][records["_deleted"] != b"*"]
+    return _dbf_field(col, *desc, encoding).astype(dtype)